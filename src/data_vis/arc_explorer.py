@@ -6,135 +6,188 @@ This script provides additional functionality for exploring ARC data,
 including statistics and interactive features.
 """
 
-import json
+import matplotlib
+matplotlib.use('Agg')  # non-interactive backend; output goes to files
 import matplotlib.pyplot as plt
 import numpy as np
 from pathlib import Path
-from collections import Counter
+from collections import namedtuple
 import random
 
-def analyze_data_statistics(challenges, solutions):
+from arc_visualizer import COLOR_MAP, load_json
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; the NumPy path below still works
+    njit = None
+
+# ARC palette for the color-usage bar chart, in value order
+BAR_COLORS = tuple(COLOR_MAP[i] for i in range(10))
+
+def _to_u8(grid):
+    """Convert a nested-list grid to a compact uint8 array."""
+    return np.asarray(grid, dtype=np.uint8)
+
+# One parsed training example: challenge id, split name and uint8 grids
+Example = namedtuple('Example', ['challenge_id', 'split', 'input', 'output'])
+
+# Per-example aggregates as parallel arrays, filled in a single pass
+ExampleStats = namedtuple('ExampleStats', ['challenge_ids', 'input_sizes', 'output_sizes',
+                                           'input_presence', 'output_presence'])
+
+if njit is not None:
+    @njit(cache=True)
+    def _presence_mask(flat):
+        """Presence of each value 0-9 in a flat uint8 buffer (compiled loop)."""
+        presence = np.zeros(10, dtype=np.bool_)
+        for value in flat:
+            presence[value] = True
+        return presence
+else:
+    def _presence_mask(flat):
+        """Presence of each value 0-9 in a flat uint8 buffer (NumPy fallback)."""
+        presence = np.zeros(10, dtype=bool)
+        presence[flat] = True
+        return presence
+
+def _prepare_grids(challenges):
+    """Parse every training grid once into uint8 arrays for all analyzers."""
+    examples = []
+    for challenge_id, challenge in challenges.items():
+        for example in challenge['train']:
+            examples.append(Example(challenge_id, 'train',
+                                    _to_u8(example['input']),
+                                    _to_u8(example['output'])))
+    return examples
+
+def _compute_example_stats(examples):
+    """Aggregate shapes and color presence for all examples in one pass."""
+    n = len(examples)
+    challenge_ids = np.empty(n, dtype=object)
+    input_sizes = np.empty((n, 2), dtype=np.int16)
+    output_sizes = np.empty((n, 2), dtype=np.int16)
+    input_presence = np.zeros((n, 10), dtype=bool)
+    output_presence = np.zeros((n, 10), dtype=bool)
+
+    for i, (challenge_id, _, input_grid, output_grid) in enumerate(examples):
+        challenge_ids[i] = challenge_id
+        input_sizes[i] = input_grid.shape
+        output_sizes[i] = output_grid.shape
+        input_presence[i] = _presence_mask(input_grid.ravel())
+        output_presence[i] = _presence_mask(output_grid.ravel())
+
+    return ExampleStats(challenge_ids, input_sizes, output_sizes,
+                        input_presence, output_presence)
+
+def _minmax_sizes(sizes):
+    """Lexicographic min and max of an (M, 2) size array, as plain tuples."""
+    order = np.lexsort((sizes[:, 1], sizes[:, 0]))
+    return tuple(sizes[order[0]].tolist()), tuple(sizes[order[-1]].tolist())
+
+def analyze_data_statistics(challenges, solutions, examples, example_stats):
     """Analyze and print statistics about the ARC dataset."""
     print("=== ARC Dataset Statistics ===")
     print(f"Total challenges: {len(challenges)}")
     print(f"Total solutions: {len(solutions)}")
-    
-    # Training examples statistics
-    train_counts = []
-    test_counts = []
-    input_sizes = []
-    output_sizes = []
-    unique_values = set()
-    
-    for challenge_id, challenge in challenges.items():
-        train_counts.append(len(challenge['train']))
-        test_counts.append(len(challenge['test']))
-        
-        # Analyze training examples
-        for example in challenge['train']:
-            input_grid = np.array(example['input'])
-            output_grid = np.array(example['output'])
-            
-            input_sizes.append(input_grid.shape)
-            output_sizes.append(output_grid.shape)
-            
-            # Collect unique values
-            unique_values.update(input_grid.flatten())
-            unique_values.update(output_grid.flatten())
+
+    # Training examples statistics, filled into preallocated arrays
+    n_challenges = len(challenges)
+    train_counts = np.empty(n_challenges, dtype=np.int32)
+    test_counts = np.empty(n_challenges, dtype=np.int32)
+    color_counts = np.zeros(10, dtype=np.int64)  # frequency of each value 0-9
+
+    for i, challenge in enumerate(challenges.values()):
+        train_counts[i] = len(challenge['train'])
+        test_counts[i] = len(challenge['test'])
+
+    # Accumulate value frequencies over the pre-parsed training examples
+    for example in examples:
+        color_counts += np.bincount(example.input.ravel(), minlength=10)
+        color_counts += np.bincount(example.output.ravel(), minlength=10)
+
+    input_sizes = example_stats.input_sizes
+    output_sizes = example_stats.output_sizes
+    unique_values = np.flatnonzero(color_counts).tolist()
     
     print(f"\nTraining examples per challenge:")
-    print(f"  Min: {min(train_counts)}, Max: {max(train_counts)}, Avg: {np.mean(train_counts):.1f}")
-    
+    print(f"  Min: {train_counts.min()}, Max: {train_counts.max()}, Avg: {train_counts.mean():.1f}")
+
     print(f"\nTest examples per challenge:")
-    print(f"  Min: {min(test_counts)}, Max: {max(test_counts)}, Avg: {np.mean(test_counts):.1f}")
-    
+    print(f"  Min: {test_counts.min()}, Max: {test_counts.max()}, Avg: {test_counts.mean():.1f}")
+
     print(f"\nGrid sizes (height x width):")
-    input_areas = [h * w for h, w in input_sizes]
-    output_areas = [h * w for h, w in output_sizes]
-    
-    print(f"  Input sizes - Min: {min(input_sizes)}, Max: {max(input_sizes)}")
-    print(f"  Output sizes - Min: {min(output_sizes)}, Max: {max(output_sizes)}")
-    print(f"  Input areas - Min: {min(input_areas)}, Max: {max(input_areas)}, Avg: {np.mean(input_areas):.1f}")
-    print(f"  Output areas - Min: {min(output_areas)}, Max: {max(output_areas)}, Avg: {np.mean(output_areas):.1f}")
-    
-    print(f"\nUnique values in dataset: {sorted(unique_values)}")
-    
+    input_areas = input_sizes.prod(axis=1)
+    output_areas = output_sizes.prod(axis=1)
+
+    input_min, input_max = _minmax_sizes(input_sizes)
+    output_min, output_max = _minmax_sizes(output_sizes)
+    print(f"  Input sizes - Min: {input_min}, Max: {input_max}")
+    print(f"  Output sizes - Min: {output_min}, Max: {output_max}")
+    print(f"  Input areas - Min: {input_areas.min()}, Max: {input_areas.max()}, Avg: {input_areas.mean():.1f}")
+    print(f"  Output areas - Min: {output_areas.min()}, Max: {output_areas.max()}, Avg: {output_areas.mean():.1f}")
+
+    print(f"\nUnique values in dataset: {unique_values}")
+
     return {
         'train_counts': train_counts,
         'test_counts': test_counts,
         'input_sizes': input_sizes,
         'output_sizes': output_sizes,
-        'unique_values': sorted(unique_values)
+        'unique_values': unique_values,
+        'color_counts': color_counts
     }
 
-def find_interesting_challenges(challenges, solutions):
+def find_interesting_challenges(example_stats):
     """Find challenges with interesting properties."""
     print("\n=== Interesting Challenges ===")
-    
-    # Find challenges with different properties
-    large_grids = []
-    small_grids = []
-    many_colors = []
-    simple_patterns = []
-    size_changes = []
-    
-    for challenge_id, challenge in challenges.items():
-        for example in challenge['train']:
-            input_grid = np.array(example['input'])
-            output_grid = np.array(example['output'])
-            
-            input_size = input_grid.size
-            output_size = output_grid.size
-            
-            # Large grids (> 200 cells)
-            if input_size > 200 or output_size > 200:
-                large_grids.append(challenge_id)
-            
-            # Small grids (< 10 cells)
-            if input_size < 10 or output_size < 10:
-                small_grids.append(challenge_id)
-            
-            # Many colors (> 5 unique values)
-            unique_input = len(set(input_grid.flatten()))
-            unique_output = len(set(output_grid.flatten()))
-            if unique_input > 5 or unique_output > 5:
-                many_colors.append(challenge_id)
-            
-            # Simple patterns (only 1-2 colors)
-            if unique_input <= 2 and unique_output <= 2:
-                simple_patterns.append(challenge_id)
-            
-            # Size changes
-            if input_grid.shape != output_grid.shape:
-                size_changes.append(challenge_id)
-    
-    # Remove duplicates and show samples
-    large_grids = list(set(large_grids))
-    small_grids = list(set(small_grids))
-    many_colors = list(set(many_colors))
-    simple_patterns = list(set(simple_patterns))
-    size_changes = list(set(size_changes))
-    
+
+    # Per-example quantities as plain ndarray reductions
+    input_areas = example_stats.input_sizes.prod(axis=1)
+    output_areas = example_stats.output_sizes.prod(axis=1)
+    unique_inputs = example_stats.input_presence.sum(axis=1)
+    unique_outputs = example_stats.output_presence.sum(axis=1)
+
+    # Category membership as boolean masks over all examples
+    large = (input_areas > 200) | (output_areas > 200)
+    small = (input_areas < 10) | (output_areas < 10)
+    many = (unique_inputs > 5) | (unique_outputs > 5)
+    simple = (unique_inputs <= 2) & (unique_outputs <= 2)
+    size_change = (example_stats.input_sizes != example_stats.output_sizes).any(axis=1)
+
+    challenge_ids = example_stats.challenge_ids
+    large_grids = np.unique(challenge_ids[large])
+    small_grids = np.unique(challenge_ids[small])
+    many_colors = np.unique(challenge_ids[many])
+    simple_patterns = np.unique(challenge_ids[simple])
+    size_changes = np.unique(challenge_ids[size_change])
+
+    rng = np.random.default_rng()
+
+    def preview(ids):
+        """Sample up to three challenge IDs for display."""
+        return rng.choice(ids, size=min(3, len(ids)), replace=False).tolist()
+
     print(f"Challenges with large grids (>200 cells): {len(large_grids)}")
-    if large_grids:
-        print(f"  Examples: {random.sample(large_grids, min(3, len(large_grids)))}")
-    
+    if large_grids.size:
+        print(f"  Examples: {preview(large_grids)}")
+
     print(f"Challenges with small grids (<10 cells): {len(small_grids)}")
-    if small_grids:
-        print(f"  Examples: {random.sample(small_grids, min(3, len(small_grids)))}")
-    
+    if small_grids.size:
+        print(f"  Examples: {preview(small_grids)}")
+
     print(f"Challenges with many colors (>5): {len(many_colors)}")
-    if many_colors:
-        print(f"  Examples: {random.sample(many_colors, min(3, len(many_colors)))}")
-    
+    if many_colors.size:
+        print(f"  Examples: {preview(many_colors)}")
+
     print(f"Challenges with simple patterns (1-2 colors): {len(simple_patterns)}")
-    if simple_patterns:
-        print(f"  Examples: {random.sample(simple_patterns, min(3, len(simple_patterns)))}")
-    
+    if simple_patterns.size:
+        print(f"  Examples: {preview(simple_patterns)}")
+
     print(f"Challenges with size changes: {len(size_changes)}")
-    if size_changes:
-        print(f"  Examples: {random.sample(size_changes, min(3, len(size_changes)))}")
-    
+    if size_changes.size:
+        print(f"  Examples: {preview(size_changes)}")
+
+
     return {
         'large_grids': large_grids,
         'small_grids': small_grids,
@@ -145,7 +198,7 @@ def find_interesting_challenges(challenges, solutions):
 
 def create_statistics_plots(stats, save_dir=None):
     """Create plots showing dataset statistics."""
-    fig, axes = plt.subplots(2, 3, figsize=(18, 12))
+    fig, axes = plt.subplots(2, 3, figsize=(18, 12), constrained_layout=True)
     fig.suptitle('ARC Dataset Statistics', fontsize=16, fontweight='bold')
     
     # Training examples per challenge
@@ -165,7 +218,7 @@ def create_statistics_plots(stats, save_dir=None):
     axes[0, 1].grid(True, alpha=0.3)
     
     # Input grid areas
-    input_areas = [h * w for h, w in stats['input_sizes']]
+    input_areas = stats['input_sizes'].prod(axis=1)
     axes[0, 2].hist(input_areas, bins=50, alpha=0.7, color='green', edgecolor='black')
     axes[0, 2].set_xlabel('Grid Area (cells)')
     axes[0, 2].set_ylabel('Frequency')
@@ -173,34 +226,30 @@ def create_statistics_plots(stats, save_dir=None):
     axes[0, 2].grid(True, alpha=0.3)
     
     # Output grid areas
-    output_areas = [h * w for h, w in stats['output_sizes']]
+    output_areas = stats['output_sizes'].prod(axis=1)
     axes[1, 0].hist(output_areas, bins=50, alpha=0.7, color='red', edgecolor='black')
     axes[1, 0].set_xlabel('Grid Area (cells)')
     axes[1, 0].set_ylabel('Frequency')
     axes[1, 0].set_title('Output Grid Areas')
     axes[1, 0].grid(True, alpha=0.3)
     
-    # Grid dimensions scatter plot
-    input_heights, input_widths = zip(*stats['input_sizes'])
-    axes[1, 1].scatter(input_widths, input_heights, alpha=0.5, s=10)
+    # Grid dimensions scatter plot (columns are height, width)
+    input_sizes = stats['input_sizes']
+    axes[1, 1].scatter(input_sizes[:, 1], input_sizes[:, 0], alpha=0.5, s=10)
     axes[1, 1].set_xlabel('Width')
     axes[1, 1].set_ylabel('Height')
     axes[1, 1].set_title('Input Grid Dimensions')
     axes[1, 1].grid(True, alpha=0.3)
     
-    # Color usage
-    axes[1, 2].bar(range(len(stats['unique_values'])), 
-                   [1] * len(stats['unique_values']),  # Placeholder for actual color frequency
-                   color=[f"C{i}" for i in stats['unique_values']])
+    # Color usage, drawn in the actual ARC palette
+    axes[1, 2].bar(range(10), stats['color_counts'],
+                   color=BAR_COLORS, alpha=0.8, edgecolor='black')
     axes[1, 2].set_xlabel('Color Value')
-    axes[1, 2].set_ylabel('Present in Dataset')
-    axes[1, 2].set_title('Colors Used in Dataset')
-    axes[1, 2].set_xticks(range(len(stats['unique_values'])))
-    axes[1, 2].set_xticklabels(stats['unique_values'])
+    axes[1, 2].set_ylabel('Cell Count')
+    axes[1, 2].set_title('Color Usage in Dataset')
+    axes[1, 2].set_xticks(range(10))
     axes[1, 2].grid(True, alpha=0.3)
-    
-    plt.tight_layout()
-    
+
     if save_dir:
         save_path = Path(save_dir) / 'arc_statistics.png'
         plt.savefig(save_path, dpi=150, bbox_inches='tight')
@@ -216,20 +265,22 @@ def main():
     
     challenges_path = Path(data_dir) / 'arc-agi_training_challenges.json'
     solutions_path = Path(data_dir) / 'arc-agi_training_solutions.json'
-    
-    with open(challenges_path, 'r') as f:
-        challenges = json.load(f)
-    
-    with open(solutions_path, 'r') as f:
-        solutions = json.load(f)
-    
+
+    challenges = load_json(challenges_path)
+    solutions = load_json(solutions_path)
+
+
     print(f"Loaded {len(challenges)} challenges and {len(solutions)} solutions")
     
+    # Parse every grid once, then share the arrays across both analyzers
+    examples = _prepare_grids(challenges)
+    example_stats = _compute_example_stats(examples)
+
     # Analyze statistics
-    stats = analyze_data_statistics(challenges, solutions)
-    
+    stats = analyze_data_statistics(challenges, solutions, examples, example_stats)
+
     # Find interesting challenges
-    interesting = find_interesting_challenges(challenges, solutions)
+    interesting = find_interesting_challenges(example_stats)
     
     # Create statistics plots
     create_statistics_plots(stats)
@@ -240,16 +291,16 @@ def main():
     # Recommend some diverse challenges
     recommendations = []
     
-    if interesting['simple_patterns']:
+    if interesting['simple_patterns'].size:
         recommendations.append(f"Simple patterns: {random.choice(interesting['simple_patterns'])}")
-    
-    if interesting['size_changes']:
+
+    if interesting['size_changes'].size:
         recommendations.append(f"Size changes: {random.choice(interesting['size_changes'])}")
-    
-    if interesting['many_colors']:
+
+    if interesting['many_colors'].size:
         recommendations.append(f"Many colors: {random.choice(interesting['many_colors'])}")
-    
-    if interesting['large_grids']:
+
+    if interesting['large_grids'].size:
         recommendations.append(f"Large grids: {random.choice(interesting['large_grids'])}")
     
     for rec in recommendations:
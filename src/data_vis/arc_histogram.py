@@ -6,7 +6,6 @@ This script creates a histogram showing the frequency distribution of all intege
 used across all ARC challenge samples (training and test data, inputs and outputs).
 """
 
-import json
 import matplotlib.pyplot as plt
 import numpy as np
 from collections import Counter
@@ -14,74 +13,65 @@ from pathlib import Path
 import argparse
 from datetime import datetime
 
+from arc_visualizer import load_json
+
 
 def load_arc_data(data_dir="data"):
     """Load ARC challenge and solution data."""
     data_path = Path(data_dir)
-    
+
     # Load training data
     train_challenges_file = data_path / "arc-agi_training_challenges.json"
     train_solutions_file = data_path / "arc-agi_training_solutions.json"
-    
+
     # Load test data (evaluation)
     test_challenges_file = data_path / "arc-agi_evaluation_challenges.json"
     test_solutions_file = data_path / "arc-agi_evaluation_solutions.json"
-    
-    with open(train_challenges_file, 'r') as f:
-        train_challenges = json.load(f)
-    
-    with open(train_solutions_file, 'r') as f:
-        train_solutions = json.load(f)
-        
-    with open(test_challenges_file, 'r') as f:
-        test_challenges = json.load(f)
-    
-    with open(test_solutions_file, 'r') as f:
-        test_solutions = json.load(f)
-    
+
+    train_challenges = load_json(train_challenges_file)
+    train_solutions = load_json(train_solutions_file)
+    test_challenges = load_json(test_challenges_file)
+    test_solutions = load_json(test_solutions_file)
+
     return train_challenges, train_solutions, test_challenges, test_solutions
 
 
 def extract_all_integers(challenges, solutions):
-    """Extract all integers from challenge grids (inputs and outputs)."""
-    all_integers = []
-    
+    """Extract all integers from challenge grids (inputs and outputs) as a flat array."""
+    arrays = []
+
     for challenge_id, challenge_data in challenges.items():
         # Process training examples
         for example in challenge_data.get('train', []):
-            # Input grid
-            for row in example['input']:
-                all_integers.extend(row)
-            
-            # Output grid
-            for row in example['output']:
-                all_integers.extend(row)
-        
+            arrays.append(np.asarray(example['input'], dtype=np.int8).ravel())
+            arrays.append(np.asarray(example['output'], dtype=np.int8).ravel())
+
         # Process test examples (inputs)
         for example in challenge_data.get('test', []):
-            # Input grid
-            for row in example['input']:
-                all_integers.extend(row)
-        
+            arrays.append(np.asarray(example['input'], dtype=np.int8).ravel())
+
         # Process test solutions if available
         if challenge_id in solutions:
             solution_outputs = solutions[challenge_id]
             for solution in solution_outputs:
-                for row in solution:
-                    all_integers.extend(row)
-    
-    return all_integers
+                arrays.append(np.asarray(solution, dtype=np.int8).ravel())
+
+    if not arrays:
+        return np.empty(0, dtype=np.int8)
+
+    return np.concatenate(arrays)
 
 
 def create_histogram(all_integers, save_path=None, title="ARC Challenge Integer Distribution"):
     """Create and display histogram of integer frequencies."""
     
-    # Count frequencies
-    counter = Counter(all_integers)
-    
-    # Ensure we have all integers 0-9, even if some have 0 count
+    # Count frequencies in a single vectorized pass (values are always 0-9)
+    arr = np.asarray(all_integers, dtype=np.int64).ravel()
+    frequencies = np.bincount(arr, minlength=10)[:10].tolist()
     integers = list(range(10))
-    frequencies = [counter.get(i, 0) for i in integers]
+
+    # Counter-compatible view for print_statistics
+    counter = Counter(dict(enumerate(frequencies)))
     
     # Create the histogram
     plt.figure(figsize=(12, 8))
@@ -194,27 +184,28 @@ def main():
     include_test = not args.training_only
     
     # Collect integers from specified datasets
-    all_integers = []
+    integer_arrays = []
     title_parts = []
-    
+
     if include_training:
         print("Extracting integers from training data...")
         train_integers = extract_all_integers(train_challenges, train_solutions)
-        all_integers.extend(train_integers)
+        integer_arrays.append(train_integers)
         title_parts.append("Training")
         print(f"Found {len(train_integers):,} integers in training data")
-    
+
     if include_test:
         print("Extracting integers from test data...")
         test_integers = extract_all_integers(test_challenges, test_solutions)
-        all_integers.extend(test_integers)
+        integer_arrays.append(test_integers)
         title_parts.append("Test")
         print(f"Found {len(test_integers):,} integers in test data")
-    
-    if not all_integers:
+
+    if not integer_arrays:
         print("No data selected! Please include training and/or test data.")
         return
-    
+
+    all_integers = np.concatenate(integer_arrays)
     print(f"\nTotal integers collected: {len(all_integers):,}")
     
     # Generate title
@@ -13,14 +13,33 @@ Date: 2025
 #TODO: Add some stats on histo of colors, sizes etc.
 # Document your state space model approach in the readme
 import json
+import os
+import matplotlib
+matplotlib.use('Agg')  # non-interactive backend; output goes to files
 import matplotlib.pyplot as plt
-import matplotlib.patches as patches
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.colors import to_rgba
+from PIL import Image
 import numpy as np
 import random
 import argparse
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:  # fall back to stdlib json when orjson is unavailable
+    orjson = None
+
+def load_json(path):
+    """Load a JSON file, using orjson when available for faster parsing."""
+    path = Path(path)
+    if orjson is not None:
+        return orjson.loads(path.read_bytes())
+    with open(path, 'r') as f:
+        return json.load(f)
+
 # Color map for integers 0-9 (using distinct colors)
 COLOR_MAP = {
     0: '#000000',  # Black
@@ -38,135 +57,134 @@ COLOR_MAP = {
 # Special color for padding (light gray with different tone)
 PADDING_COLOR = '#F0F0F0'  # Very light gray for padding
 
+# RGBA lookup table: row 0 is the padding color, rows 1-10 the data colors.
+# Indexing it with (grid + 1) yields an (H, W, 4) image in one fancy-index.
+COLOR_ARRAY = np.vstack([to_rgba(PADDING_COLOR)] + [to_rgba(COLOR_MAP[i]) for i in range(10)])
+
 def load_data(data_dir):
     """Load ARC training challenges and solutions."""
     challenges_path = Path(data_dir) / 'arc-agi_training_challenges.json'
     solutions_path = Path(data_dir) / 'arc-agi_training_solutions.json'
-    
-    with open(challenges_path, 'r') as f:
-        challenges = json.load(f)
-    
-    with open(solutions_path, 'r') as f:
-        solutions = json.load(f)
-    
+
+    challenges = load_json(challenges_path)
+    solutions = load_json(solutions_path)
+
     return challenges, solutions
 
 def plot_grid(ax, grid, title, max_size=30):
     """Plot a single grid with proper colors and padding."""
-    original_grid = np.array(grid)
+    original_grid = np.asarray(grid, dtype=np.uint8)
     original_height, original_width = original_grid.shape
-    
+
     # Create padding info
     use_padding = original_height < max_size or original_width < max_size
-    
+
     if use_padding:
-        # Create a padded grid filled with a special padding value (-1)
-        padded_grid = np.full((max_size, max_size), -1)  # -1 indicates padding
+        # Shift data values up by one so index 0 (the COLOR_ARRAY padding
+        # row) marks the padded border — no sentinel value or branch needed
+        padded_grid = np.zeros((max_size, max_size), dtype=np.uint8)
         # Center the original grid in the padded area
         start_h = (max_size - original_height) // 2
         start_w = (max_size - original_width) // 2
-        padded_grid[start_h:start_h + original_height, start_w:start_w + original_width] = original_grid
-        
+        padded_grid[start_h:start_h + original_height, start_w:start_w + original_width] = original_grid + 1
+
         display_grid = padded_grid
         display_height, display_width = max_size, max_size
     else:
-        display_grid = original_grid
+        display_grid = original_grid + 1
         display_height, display_width = original_height, original_width
-    
-    # Clear the axes
-    ax.clear()
-    ax.set_xlim(0, display_width)
-    ax.set_ylim(0, display_height)
-    ax.set_aspect('equal')
-    ax.invert_yaxis()  # Invert y-axis to match standard image coordinates
-    
-    # Draw each cell
-    for i in range(display_height):
-        for j in range(display_width):
-            value = int(display_grid[i, j])
-            
-            # Choose color based on whether it's padding or actual data
-            if value == -1:  # Padding
-                color = PADDING_COLOR
-                edge_color = '#D0D0D0'  # Lighter edge for padding
-            else:  # Actual data
-                color = COLOR_MAP[value]
-                edge_color = 'gray'
-            
-            # Create rectangle for each cell
-            rect = patches.Rectangle((j, i), 1, 1, 
-                                   linewidth=0.5, 
-                                   edgecolor=edge_color, 
-                                   facecolor=color)
-            ax.add_patch(rect)
-    
+
+    # Render the whole grid in a single raster blit instead of one Rectangle per cell
+    ax.imshow(COLOR_ARRAY[display_grid], interpolation='nearest')
+
+    # Draw cell borders via minor-tick gridlines (major ticks are preset empty)
+    ax.set_xticks(np.arange(-0.5, display_width), minor=True)
+    ax.set_yticks(np.arange(-0.5, display_height), minor=True)
+    ax.grid(which='minor', color='gray', linewidth=0.5)
+    ax.tick_params(which='minor', length=0)
+
     # Set title
     ax.set_title(title, fontsize=10, pad=5)
-    ax.set_xticks([])
-    ax.set_yticks([])
 
-def visualize_challenge(challenge_id, challenge_data, solution_data=None, save_path=None):
-    """Visualize a single challenge with its training examples and test cases."""
+def visualize_challenge(challenge_id, challenge_data, solution_data=None, save_path=None, fig=None):
+    """Visualize a single challenge with its training examples and test cases.
+
+    Pass an existing figure via `fig` to reuse it across challenges; it is
+    cleared first and left open for the caller.
+    """
     train_examples = challenge_data['train']
     test_examples = challenge_data['test']
-    
+
     # Calculate total columns needed
     # Each training example needs 2 columns (input, output)
     # Each test example needs 2 columns (input, solution)
     n_train = len(train_examples)
     n_test = len(test_examples)
-    
+
     train_cols = n_train * 2
     test_cols = n_test * 2  # Just input and solution for test cases
     max_cols = max(train_cols, test_cols)
-    
-    # Create figure with 2 rows (training, test)
-    fig = plt.figure(figsize=(max_cols * 2.5, 6))
+
+    # Create figure with 2 rows (training, test), or reuse the caller's
+    owns_fig = fig is None
+    if owns_fig:
+        fig = plt.figure(figsize=(max_cols * 2.5, 6), constrained_layout=True)
+    else:
+        fig.clear()
+        fig.set_size_inches(max_cols * 2.5, 6)
     fig.suptitle(f'ARC Challenge: {challenge_id}', fontsize=16, fontweight='bold')
-    
+
+    # Create the whole axes grid in one call; positions that stay unused
+    # (when the rows have different lengths) are hidden below
+    axes = fig.subplots(2, max_cols, squeeze=False,
+                        subplot_kw={'xticks': [], 'yticks': [], 'aspect': 'equal'})
+    for ax in axes.ravel():
+        ax.set_visible(False)
+
     # Plot training examples in first row
     for i, example in enumerate(train_examples):
         # Input
-        ax_input = plt.subplot(2, max_cols, i * 2 + 1)
+        ax_input = axes[0, i * 2]
+        ax_input.set_visible(True)
         plot_grid(ax_input, example['input'], f'Train {i+1} Input')
-        
+
         # Output
-        ax_output = plt.subplot(2, max_cols, i * 2 + 2)
+        ax_output = axes[0, i * 2 + 1]
+        ax_output.set_visible(True)
         plot_grid(ax_output, example['output'], f'Train {i+1} Output')
-    
+
     # Plot test examples in second row
     for i, example in enumerate(test_examples):
-        # Calculate positions in second row (row index 2)
-        input_pos = max_cols + (i * 2) + 1   # Second row, correct column for input
-        solution_pos = max_cols + (i * 2) + 2  # Second row, correct column for solution
-        
         # Test Input
-        ax_input = plt.subplot(2, max_cols, input_pos)
+        ax_input = axes[1, i * 2]
+        ax_input.set_visible(True)
         plot_grid(ax_input, example['input'], f'Test {i+1} Input')
-        
+
         # Test Solution (from solutions file)
+        ax_solution = axes[1, i * 2 + 1]
+        ax_solution.set_visible(True)
         if solution_data and i < len(solution_data):
-            ax_solution = plt.subplot(2, max_cols, solution_pos)
             plot_grid(ax_solution, solution_data[i], f'Test {i+1} Solution')
         else:
             # Show placeholder if no solution available
-            ax_solution = plt.subplot(2, max_cols, solution_pos)
-            ax_solution.text(0.5, 0.5, 'No Solution\nAvailable', 
+            ax_solution.text(0.5, 0.5, 'No Solution\nAvailable',
                            horizontalalignment='center', verticalalignment='center',
                            fontsize=12, color='red')
             ax_solution.set_xlim(0, 1)
             ax_solution.set_ylim(0, 1)
             ax_solution.set_title(f'Test {i+1} Solution', fontsize=10, pad=5)
-            ax_solution.set_xticks([])
-            ax_solution.set_yticks([])
-            ax_solution.set_yticks([])
-    
-    plt.tight_layout()
-    
+
     if save_path:
-        plt.savefig(save_path, dpi=150, bbox_inches='tight')
+        # Rasterize once with Agg and let Pillow encode the PNG; a low
+        # compression level favors encode speed over file size
+        canvas = FigureCanvasAgg(fig)
+        canvas.draw()
+        image = Image.frombuffer('RGBA', canvas.get_width_height(),
+                                 canvas.buffer_rgba(), 'raw', 'RGBA', 0, 1)
+        image.save(save_path, 'PNG', compress_level=1)
         print(f"Saved visualization to {save_path}")
-        plt.close(fig)  # Close to free memory
+        if owns_fig:
+            plt.close(fig)  # Close to free memory
     else:
         plt.show()
 
@@ -177,26 +195,38 @@ def create_timestamped_directory():
     save_dir.mkdir(parents=True, exist_ok=True)
     return save_dir
 
+# Reusable figure, one per worker process (figure creation is expensive)
+_worker_fig = None
+
+def _render_one(args):
+    """Render a single challenge to disk (worker for the process pool)."""
+    global _worker_fig
+    if _worker_fig is None:
+        _worker_fig = plt.figure(constrained_layout=True)
+
+    challenge_id, challenge_data, solution_data, save_path = args
+    visualize_challenge(challenge_id, challenge_data, solution_data, save_path,
+                        fig=_worker_fig)
+
 def visualize_random_challenges(challenges, solutions, n_samples=10, save_dir=None):
     """Visualize n random challenges as separate PNG files."""
     if save_dir is None:
         save_dir = create_timestamped_directory()
-    
+
     # Select random challenges
     challenge_ids = random.sample(list(challenges.keys()), min(n_samples, len(challenges)))
-    
+
     print(f"Visualizing {len(challenge_ids)} random challenges...")
     print(f"Saving to directory: {save_dir}")
-    
-    for i, challenge_id in enumerate(challenge_ids, 1):
-        print(f"Processing challenge {i}/{len(challenge_ids)}: {challenge_id}")
-        
-        challenge_data = challenges[challenge_id]
-        solution_data = solutions.get(challenge_id)
-        
-        save_path = save_dir / f"challenge_{challenge_id}.png"
-        visualize_challenge(challenge_id, challenge_data, solution_data, save_path)
-    
+
+    # Every figure is independent, so render them across all cores
+    tasks = [(challenge_id, challenges[challenge_id], solutions.get(challenge_id),
+              save_dir / f"challenge_{challenge_id}.png")
+             for challenge_id in challenge_ids]
+
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as pool:
+        list(pool.map(_render_one, tasks))
+
     print(f"\nCompleted! All visualizations saved to: {save_dir}")
     return save_dir
 